@@ -5,8 +5,6 @@ Performs intelligent comparison between Excel workbooks with detailed change det
 """
 
 import logging
-import pandas as pd
-import numpy as np
 from typing import Dict, List, Any, Tuple, Optional
 from pathlib import Path
 import openpyxl
@@ -520,6 +518,8 @@ class WorkbookComparator:
 
     def export_comparison_report(self, output_path: str, comparison_results: Dict[str, Any]):
         """Export detailed comparison report to Excel"""
+        import pandas as pd
+
         try:
             with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
                 # Summary sheet
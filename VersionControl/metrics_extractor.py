@@ -15,17 +15,20 @@ from openpyxl.utils import get_column_letter, column_index_from_string
 class MetricsExtractor:
     """Intelligent extraction of key financial metrics from Excel databooks"""
 
-    def __init__(self, workbook_path: str, config: Dict[str, Any]):
+    def __init__(self, workbook_path: str, config: Dict[str, Any],
+                 formula_workbook: Optional[openpyxl.Workbook] = None):
         """
         Initialize metrics extractor
 
         Args:
             workbook_path: Path to Excel workbook
             config: Configuration dictionary with metric locations
+            formula_workbook: Already loaded formulas workbook to use for formula counting
         """
         self.workbook_path = Path(workbook_path)
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self.formula_workbook = formula_workbook
 
         # Load workbook
         try:
@@ -325,16 +328,20 @@ class MetricsExtractor:
         formula_count = 0
 
         try:
-            # Reload workbook with formulas (not values)
-            formula_wb = openpyxl.load_workbook(str(self.workbook_path), data_only=False)
+            # Reload workbook with formulas (not values) unless one was shared
+            formula_wb = self.formula_workbook
+            if formula_wb is None:
+                formula_wb = openpyxl.load_workbook(str(self.workbook_path), data_only=False)
 
+            # Walk only stored cells; iter_rows would create an empty cell at every
+            # gap in the used range, bloating a shared workbook that is saved later
             for sheet in formula_wb.worksheets:
-                for row in sheet.iter_rows():
-                    for cell in row:
-                        if cell.data_type == 'f':  # Formula cell
-                            formula_count += 1
+                for cell in sheet._cells.values():
+                    if cell.data_type == 'f':  # Formula cell
+                        formula_count += 1
 
-            formula_wb.close()
+            if self.formula_workbook is None:
+                formula_wb.close()
 
         except Exception as e:
             self.logger.warning(f"Error counting formulas: {str(e)}")
@@ -10,23 +10,65 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import shutil
+import hashlib
 import os
+import queue
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Maximum number of queued metadata saves written per write-behind batch
+WRITE_BATCH_SIZE = 16
+
+# Metadata reads below this count are done serially (thread pool not worth it)
+PARALLEL_READ_THRESHOLD = 8
+
+# Parsed version metadata shared across StorageManager instances in this process,
+# keyed by path and validated against (st_mtime_ns, st_size)
+_METADATA_CACHE: Dict[str, tuple] = {}
+_METADATA_CACHE_LOCK = threading.Lock()
+
+# Most metadata files kept in _METADATA_CACHE; the oldest entries are evicted first
+METADATA_CACHE_SIZE = 512
+
+
+def _atomic_write_bytes(path: Path, data: bytes):
+    """Write data to path via a sibling temp file and an atomic rename"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
 
 
 class StorageManager:
     """Manages version metadata and file organization for the version control system"""
 
-    def __init__(self, project_name: str, config: Dict[str, Any]):
+    __slots__ = (
+        "project_name", "config", "logger",
+        "base_dir", "project_dir", "metadata_dir", "snapshots_dir",
+        "versions_index_file", "project_info_file",
+        "versions_index", "project_info", "_index_digest", "_index_mtime_ns",
+        "_index_generation",
+        "_lock", "_write_queue", "_writer_thread"
+    )
+
+    def __init__(self, project_name: str, config: Dict[str, Any], async_writes: bool = False):
         """
         Initialize storage manager
 
         Args:
             project_name: Name of the project/workbook
             config: Configuration dictionary
+            async_writes: If True, metadata saves are written by a background
+                thread in batches; call close() to flush pending writes
         """
         self.project_name = project_name
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._write_queue = None
+        self._writer_thread = None
+        self._index_generation = 0
 
         # Set up storage paths
         self.base_dir = Path("Versions")
@@ -44,6 +86,67 @@ class StorageManager:
         # Load or initialize metadata
         self._load_metadata()
 
+        # Start write-behind worker if requested
+        if async_writes:
+            self._write_queue = queue.Queue(maxsize=WRITE_BATCH_SIZE * 4)
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop,
+                name=f"StorageManager-{self.project_name}",
+                daemon=True
+            )
+            self._writer_thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Flush pending background writes and stop the writer thread"""
+        if self._writer_thread is None:
+            return
+
+        self._write_queue.put(None)
+        self._writer_thread.join()
+        self._writer_thread = None
+        self._write_queue = None
+
+    def _writer_loop(self):
+        """Drain queued metadata saves and write them in batches"""
+        while True:
+            items = [self._write_queue.get()]
+            while len(items) < WRITE_BATCH_SIZE and not self._write_queue.empty():
+                items.append(self._write_queue.get_nowait())
+
+            stop = None in items
+            items = [item for item in items if item is not None]
+            if items:
+                try:
+                    self._flush_batch(items)
+                except Exception as e:
+                    self.logger.error(f"Failed to write queued version metadata: {str(e)}")
+
+            if stop:
+                return
+
+    def _flush_batch(self, items: List[tuple]):
+        """
+        Write per-version metadata files, then the index and project info once
+
+        Args:
+            items: (version_info, metadata_file, metadata_bytes) tuples
+        """
+        for _, version_metadata_file, metadata_bytes in items:
+            _atomic_write_bytes(version_metadata_file, metadata_bytes)
+            # A same-size rewrite within one mtime tick would look unchanged to the cache
+            with _METADATA_CACHE_LOCK:
+                _METADATA_CACHE.pop(str(version_metadata_file), None)
+
+        with self._lock:
+            self._save_versions_index()
+            self._update_project_info(items[-1][0])
+
     def _setup_directories(self):
         """Create necessary directory structure"""
         directories = [
@@ -59,10 +162,15 @@ class StorageManager:
     def _load_metadata(self):
         """Load existing metadata or initialize new structures"""
         # Load versions index
+        self._index_digest = None
+        self._index_mtime_ns = None
+        self._index_generation += 1
         if self.versions_index_file.exists():
             try:
-                with open(self.versions_index_file, 'r') as f:
-                    self.versions_index = json.load(f)
+                self._index_mtime_ns = self.versions_index_file.stat().st_mtime_ns
+                raw_index = self.versions_index_file.read_bytes()
+                self.versions_index = json.loads(raw_index)
+                self._index_digest = hashlib.sha1(raw_index).digest()
             except Exception as e:
                 self.logger.warning(f"Failed to load versions index: {str(e)}")
                 self.versions_index = {"versions": [], "next_version_number": 1}
@@ -80,6 +188,25 @@ class StorageManager:
         else:
             self.project_info = self._get_default_project_info()
 
+    def reload_if_changed(self) -> bool:
+        """
+        Reload metadata if the versions index was modified by another process
+
+        Returns:
+            True if metadata was reloaded, False if it was already current
+        """
+        try:
+            index_mtime_ns = self.versions_index_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            index_mtime_ns = None
+
+        if index_mtime_ns == self._index_mtime_ns:
+            return False
+
+        with self._lock:
+            self._load_metadata()
+        return True
+
     def _get_default_project_info(self) -> Dict[str, Any]:
         """Return default project information structure"""
         return {
@@ -110,46 +237,57 @@ class StorageManager:
         try:
             version_name = version_info["version"]
 
-            # Create individual version metadata file
             version_metadata_file = self.metadata_dir / f"{version_name}.json"
-            with open(version_metadata_file, 'w') as f:
-                json.dump(version_info, f, indent=2, default=str)
-
-            # Update versions index
-            version_entry = {
-                "version": version_name,
-                "timestamp": version_info["timestamp"],
-                "datetime": version_info["datetime"],
-                "file_size": version_info["file_size"],
-                "notes": version_info.get("notes", ""),
-                "metadata_file": str(version_metadata_file),
-                "snapshot_file": version_info["file_path"]
-            }
-
-            # Remove existing entry if it exists (for updates)
-            self.versions_index["versions"] = [
-                v for v in self.versions_index["versions"]
-                if v["version"] != version_name
-            ]
-
-            # Add new entry
-            self.versions_index["versions"].append(version_entry)
-
-            # Sort by version name for consistent ordering
-            self.versions_index["versions"].sort(key=lambda x: x["version"])
-
-            # Update next version number
-            current_version_num = int(version_name[1:])  # Remove 'v' prefix
-            self.versions_index["next_version_number"] = max(
-                self.versions_index["next_version_number"],
-                current_version_num + 1
-            )
+            metadata_bytes = json.dumps(version_info, indent=2, default=str).encode('utf-8')
 
-            # Save updated index
-            self._save_versions_index()
+            with self._lock:
+                # Skip all writes when re-saving an unchanged, already indexed version
+                if any(v["version"] == version_name for v in self._iter_versions()):
+                    try:
+                        if version_metadata_file.read_bytes() == metadata_bytes:
+                            self.logger.info(f"No-op save for version {version_name}: metadata unchanged")
+                            return True
+                    except FileNotFoundError:
+                        pass
+
+                # Update versions index
+                version_entry = {
+                    "version": version_name,
+                    "timestamp": version_info["timestamp"],
+                    "datetime": version_info["datetime"],
+                    "file_size": version_info["file_size"],
+                    "notes": version_info.get("notes", ""),
+                    "metadata_file": str(version_metadata_file),
+                    "snapshot_file": version_info["file_path"]
+                }
+
+                # Replace existing entry in place (for updates), otherwise append
+                versions = self.versions_index["versions"]
+                for idx, existing in enumerate(versions):
+                    if existing["version"] == version_name:
+                        versions[idx] = version_entry
+                        break
+                else:
+                    versions.append(version_entry)
+
+                    # Keep ordering by version name; new versions normally sort last
+                    if len(versions) > 1 and versions[-2]["version"] > version_name:
+                        versions.sort(key=lambda x: x["version"])
+                self._index_generation += 1
+
+                # Update next version number
+                current_version_num = int(version_name[1:])  # Remove 'v' prefix
+                self.versions_index["next_version_number"] = max(
+                    self.versions_index["next_version_number"],
+                    current_version_num + 1
+                )
 
-            # Update project info
-            self._update_project_info(version_info)
+            # Write metadata file, index and project info (queued when async)
+            item = (version_info, version_metadata_file, metadata_bytes)
+            if self._write_queue is not None:
+                self._write_queue.put(item)
+            else:
+                self._flush_batch([item])
 
             self.logger.info(f"Saved metadata for version {version_name}")
             return True
@@ -171,16 +309,77 @@ class StorageManager:
         try:
             version_metadata_file = self.metadata_dir / f"{version_name}.json"
 
-            if not version_metadata_file.exists():
+            try:
+                stat_result = version_metadata_file.stat()
+            except FileNotFoundError:
                 return None
 
-            with open(version_metadata_file, 'r') as f:
-                return json.load(f)
+            # Reuse the parsed file while it is unchanged on disk
+            cache_key = str(version_metadata_file)
+            file_key = (stat_result.st_mtime_ns, stat_result.st_size)
+            cached = _METADATA_CACHE.get(cache_key)
+            if cached is None or cached[0] != file_key:
+                cached = (file_key, json.loads(version_metadata_file.read_bytes()))
+                with _METADATA_CACHE_LOCK:
+                    _METADATA_CACHE[cache_key] = cached
+                    while len(_METADATA_CACHE) > METADATA_CACHE_SIZE:
+                        _METADATA_CACHE.pop(next(iter(_METADATA_CACHE)))
+
+            # Shallow copy so callers can't add or replace keys in the cached dict
+            return dict(cached[1])
 
         except Exception as e:
             self.logger.error(f"Failed to get version info for {version_name}: {str(e)}")
             return None
 
+    def _batch_read_metadata(self, names: List[str]) -> Dict[str, bytes]:
+        """
+        Read the raw metadata files for several versions in one pass
+
+        Each file is read with a single open/read and no prior existence
+        check; versions without a metadata file are omitted. Larger batches
+        are read concurrently on a thread pool since the work is I/O-bound.
+
+        Args:
+            names: Version names to read (e.g., ["v001", "v002"])
+
+        Returns:
+            Dictionary mapping version name to raw JSON bytes, in input order
+        """
+        if len(names) < PARALLEL_READ_THRESHOLD:
+            contents = [self._read_metadata_bytes(version_name) for version_name in names]
+        else:
+            max_workers = min(32, (os.cpu_count() or 1) * 3)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                contents = list(executor.map(self._read_metadata_bytes, names))
+
+        return {
+            version_name: data
+            for version_name, data in zip(names, contents)
+            if data is not None
+        }
+
+    def _read_metadata_bytes(self, version_name: str) -> Optional[bytes]:
+        """Read one version's raw metadata file, or None if it is unavailable"""
+        try:
+            return (self.metadata_dir / f"{version_name}.json").read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.logger.warning(f"Failed to read metadata for {version_name}: {str(e)}")
+            return None
+
+    def _iter_versions(self) -> List[Dict[str, Any]]:
+        """
+        Get the internal versions list without copying it
+
+        For read-only internal use; callers must not mutate the result.
+
+        Returns:
+            List of version dictionaries from the index
+        """
+        return self.versions_index.get("versions", [])
+
     def get_all_versions(self) -> List[Dict[str, Any]]:
         """
         Get list of all versions with basic information
@@ -194,6 +393,50 @@ class StorageManager:
             self.logger.error(f"Failed to get versions list: {str(e)}")
             return []
 
+    def get_latest_version(self) -> Optional[Dict[str, Any]]:
+        """
+        Get detailed information for the most recent version
+
+        Returns:
+            Version information dictionary or None if there are no versions
+        """
+        versions = self._iter_versions()
+        if not versions:
+            return None
+        return self.get_version_info(versions[-1]["version"])
+
+    def get_snapshot_sizes(self) -> Dict[str, int]:
+        """
+        Get on-disk snapshot sizes with one directory scan per snapshot folder
+
+        Uses os.scandir so sizes come from the directory listing (free on
+        Windows) instead of a separate stat call per snapshot.
+
+        Returns:
+            Dictionary of version name to snapshot size; missing snapshots are omitted
+        """
+        versions_by_dir: Dict[str, Dict[str, str]] = {}
+        for version in self._iter_versions():
+            snapshot_path = Path(version["snapshot_file"])
+            versions_by_dir.setdefault(str(snapshot_path.parent), {})[snapshot_path.name] = version["version"]
+
+        sizes = {}
+        for directory, names in versions_by_dir.items():
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        version_name = names.get(entry.name)
+                        if version_name and entry.is_file():
+                            sizes[version_name] = entry.stat().st_size
+            except OSError:
+                continue
+        return sizes
+
+    @property
+    def index_generation(self) -> int:
+        """Counter bumped whenever the in-memory versions index changes or is reloaded"""
+        return self._index_generation
+
     def get_next_version_number(self) -> int:
         """
         Get the next version number to use
@@ -214,27 +457,31 @@ class StorageManager:
             True if successful, False otherwise
         """
         try:
-            # Remove from versions index
-            original_count = len(self.versions_index["versions"])
-            self.versions_index["versions"] = [
-                v for v in self.versions_index["versions"]
-                if v["version"] != version_name
-            ]
-
-            if len(self.versions_index["versions"]) == original_count:
-                self.logger.warning(f"Version {version_name} not found in index")
-                return False
-
-            # Remove individual metadata file
-            version_metadata_file = self.metadata_dir / f"{version_name}.json"
-            if version_metadata_file.exists():
-                version_metadata_file.unlink()
-
-            # Save updated index
-            self._save_versions_index()
-
-            # Update project statistics
-            self._recalculate_project_stats()
+            with self._lock:
+                # Remove from versions index
+                original_count = len(self.versions_index["versions"])
+                self.versions_index["versions"] = [
+                    v for v in self.versions_index["versions"]
+                    if v["version"] != version_name
+                ]
+
+                if len(self.versions_index["versions"]) == original_count:
+                    self.logger.warning(f"Version {version_name} not found in index")
+                    return False
+                self._index_generation += 1
+
+                # Remove individual metadata file
+                version_metadata_file = self.metadata_dir / f"{version_name}.json"
+                if version_metadata_file.exists():
+                    version_metadata_file.unlink()
+                with _METADATA_CACHE_LOCK:
+                    _METADATA_CACHE.pop(str(version_metadata_file), None)
+
+                # Save updated index
+                self._save_versions_index()
+
+                # Update project statistics
+                self._recalculate_project_stats()
 
             self.logger.info(f"Removed metadata for version {version_name}")
             return True
@@ -254,30 +501,30 @@ class StorageManager:
             stats = self.project_info.copy()
 
             # Real-time calculations
-            versions = self.get_all_versions()
+            versions = self._iter_versions()
             stats["current_version_count"] = len(versions)
 
             if versions:
-                # Calculate total size
+                # Single pass: total size plus latest/oldest versions
+                snapshot_sizes = self.get_snapshot_sizes()
                 total_size = 0
+                latest_version = oldest_version = versions[0]
                 for version in versions:
-                    try:
-                        snapshot_path = Path(version["snapshot_file"])
-                        if snapshot_path.exists():
-                            total_size += snapshot_path.stat().st_size
-                    except Exception:
-                        continue
+                    timestamp = version["timestamp"]
+                    if timestamp > latest_version["timestamp"]:
+                        latest_version = version
+                    elif timestamp < oldest_version["timestamp"]:
+                        oldest_version = version
+                    total_size += snapshot_sizes.get(version["version"], 0)
 
                 stats["current_total_size_bytes"] = total_size
                 stats["current_total_size_mb"] = round(total_size / (1024 * 1024), 2)
 
                 # Latest version info
-                latest_version = max(versions, key=lambda x: x["timestamp"])
                 stats["latest_version"] = latest_version["version"]
                 stats["latest_version_date"] = latest_version["datetime"]
 
                 # Oldest version info
-                oldest_version = min(versions, key=lambda x: x["timestamp"])
                 stats["oldest_version"] = oldest_version["version"]
                 stats["oldest_version_date"] = oldest_version["datetime"]
 
@@ -308,7 +555,7 @@ class StorageManager:
             List of matching versions
         """
         try:
-            versions = self.get_all_versions()
+            versions = self._iter_versions()
             matching_versions = []
 
             for version in versions:
@@ -363,8 +610,14 @@ class StorageManager:
 
             # Get all version data
             versions = []
-            for version_entry in self.get_all_versions():
-                version_data = self.get_version_info(version_entry["version"])
+            version_names = [v["version"] for v in self._iter_versions()]
+            for version_name, raw_metadata in self._batch_read_metadata(version_names).items():
+                try:
+                    version_data = json.loads(raw_metadata)
+                except ValueError as e:
+                    self.logger.warning(f"Skipping unreadable metadata for {version_name}: {str(e)}")
+                    continue
+
                 if version_data:
                     # Flatten metrics for the report
                     flat_version = {
@@ -418,12 +671,11 @@ class StorageManager:
             backup_dir = Path(backup_path)
             backup_dir.mkdir(parents=True, exist_ok=True)
 
-            # Copy metadata directory
-            metadata_backup = backup_dir / "metadata"
-            if metadata_backup.exists():
-                shutil.rmtree(metadata_backup)
-
-            shutil.copytree(self.metadata_dir, metadata_backup)
+            # Pack metadata directory into a single archive
+            metadata_backup = backup_dir / "metadata.zip"
+            with zipfile.ZipFile(metadata_backup, 'w', zipfile.ZIP_DEFLATED, compresslevel=3) as zf:
+                for metadata_file in self.metadata_dir.rglob("*"):
+                    zf.write(metadata_file, metadata_file.relative_to(self.metadata_dir))
 
             self.logger.info(f"Backed up metadata to {backup_path}")
             return True
@@ -443,16 +695,22 @@ class StorageManager:
             True if successful, False otherwise
         """
         try:
-            backup_metadata = Path(backup_path) / "metadata"
-            if not backup_metadata.exists():
-                raise FileNotFoundError(f"Backup metadata not found at {backup_metadata}")
+            backup_dir = Path(backup_path)
+            backup_archive = backup_dir / "metadata.zip"
+            backup_metadata = backup_dir / "metadata"
+            if not backup_archive.exists() and not backup_metadata.exists():
+                raise FileNotFoundError(f"Backup metadata not found at {backup_archive}")
 
             # Remove current metadata
             if self.metadata_dir.exists():
                 shutil.rmtree(self.metadata_dir)
 
-            # Restore from backup
-            shutil.copytree(backup_metadata, self.metadata_dir)
+            # Restore from backup (older backups are plain directory copies)
+            if backup_archive.exists():
+                with zipfile.ZipFile(backup_archive, 'r') as zf:
+                    zf.extractall(self.metadata_dir)
+            else:
+                shutil.copytree(backup_metadata, self.metadata_dir)
 
             # Reload metadata
             self._load_metadata()
@@ -467,8 +725,14 @@ class StorageManager:
     def _save_versions_index(self):
         """Save the versions index to file"""
         try:
-            with open(self.versions_index_file, 'w') as f:
-                json.dump(self.versions_index, f, indent=2, default=str)
+            index_bytes = json.dumps(self.versions_index, separators=(",", ":"), default=str).encode('utf-8')
+            index_digest = hashlib.sha1(index_bytes).digest()
+            if index_digest == self._index_digest:
+                return
+
+            _atomic_write_bytes(self.versions_index_file, index_bytes)
+            self._index_digest = index_digest
+            self._index_mtime_ns = self.versions_index_file.stat().st_mtime_ns
         except Exception as e:
             self.logger.error(f"Failed to save versions index: {str(e)}")
 
@@ -479,8 +743,8 @@ class StorageManager:
             self.project_info["total_versions"] = len(self.versions_index["versions"])
 
             # Save updated project info
-            with open(self.project_info_file, 'w') as f:
-                json.dump(self.project_info, f, indent=2, default=str)
+            project_info_bytes = json.dumps(self.project_info, separators=(",", ":"), default=str).encode('utf-8')
+            _atomic_write_bytes(self.project_info_file, project_info_bytes)
 
         except Exception as e:
             self.logger.error(f"Failed to update project info: {str(e)}")
@@ -488,25 +752,18 @@ class StorageManager:
     def _recalculate_project_stats(self):
         """Recalculate project statistics after version removal"""
         try:
-            versions = self.get_all_versions()
+            versions = self._iter_versions()
 
             # Recalculate total size
-            total_size = 0
-            for version in versions:
-                try:
-                    snapshot_path = Path(version["snapshot_file"])
-                    if snapshot_path.exists():
-                        total_size += snapshot_path.stat().st_size
-                except Exception:
-                    continue
+            total_size = sum(self.get_snapshot_sizes().values())
 
             self.project_info["total_size_bytes"] = total_size
             self.project_info["total_versions"] = len(versions)
             self.project_info["last_accessed"] = datetime.now().isoformat()
 
             # Save updated info
-            with open(self.project_info_file, 'w') as f:
-                json.dump(self.project_info, f, indent=2, default=str)
+            project_info_bytes = json.dumps(self.project_info, separators=(",", ":"), default=str).encode('utf-8')
+            _atomic_write_bytes(self.project_info_file, project_info_bytes)
 
         except Exception as e:
             self.logger.error(f"Failed to recalculate project stats: {str(e)}")
@@ -526,8 +783,8 @@ class StorageManager:
             }
 
             # Get current versions from index
-            indexed_versions = {v["version"] for v in self.get_all_versions()}
-            indexed_snapshots = {Path(v["snapshot_file"]).name for v in self.get_all_versions()}
+            indexed_versions = {v["version"] for v in self._iter_versions()}
+            indexed_snapshots = {Path(v["snapshot_file"]).name for v in self._iter_versions()}
 
             # Check for orphaned snapshot files
             if self.snapshots_dir.exists():
@@ -546,11 +803,11 @@ class StorageManager:
                     self.logger.info(f"Removed orphaned metadata: {metadata_file.name}")
 
             # Check for missing snapshot files
-            for version in self.get_all_versions():
-                snapshot_path = Path(version["snapshot_file"])
-                if not snapshot_path.exists():
+            snapshot_sizes = self.get_snapshot_sizes()
+            for version in self._iter_versions():
+                if version["version"] not in snapshot_sizes:
                     cleanup_stats["missing_snapshots_found"] += 1
-                    self.logger.warning(f"Missing snapshot file: {snapshot_path}")
+                    self.logger.warning(f"Missing snapshot file: {version['snapshot_file']}")
 
             return cleanup_stats
 
@@ -9,37 +9,124 @@ import json
 import logging
 import tempfile
 import os
+import subprocess
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
-import argparse
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Add the VersionControl directory to Python path
-current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
+current_dir = str(Path(__file__).parent)
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+if TYPE_CHECKING:
+    from version_control import VersionController
+
+# Maximum number of VersionController instances kept warm per bridge
+VC_CACHE_SIZE = 8
+
+# Seconds within which an identical create_snapshot request reuses the last result
+SNAPSHOT_BORROW_WINDOW = 2.0
+
+# Bridge actions (a superset of the controller CLI's, adding get_version_info)
+# that run without opening vba_bridge.log
+READ_ONLY_ACTIONS = ("list_versions", "stats", "get_version_info")
+
+
+def _dumps_result(result: Dict[str, Any], indent: bool = True, ensure_ascii: bool = False) -> bytes:
+    """Serialize a normalized command result to UTF-8 JSON, using orjson when available"""
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        data = orjson.dumps(result, option=option)
 
-from version_control import VersionController
+        # orjson always emits raw UTF-8; re-encode only if escaping is needed
+        if not ensure_ascii or data.isascii():
+            return data
+
+    if indent:
+        return json.dumps(result, indent=2, ensure_ascii=ensure_ascii).encode('utf-8')
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=ensure_ascii).encode('utf-8')
+
+
+# Scalar types emitted as-is by both json and orjson
+JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _normalize(obj: Any) -> Any:
+    """
+    Convert a result to JSON-native types once, ahead of serialization
+
+    Values that are not dicts, lists/tuples or JSON scalars (datetime, Path,
+    UUID, ...) become strings, matching the old default=str behavior.
+    """
+    if isinstance(obj, JSON_SCALARS):
+        return obj
+    if isinstance(obj, dict):
+        return {
+            (key if isinstance(key, JSON_SCALARS) else str(key)): _normalize(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_normalize(item) for item in obj]
+    return str(obj)
 
 
 class VBAPythonBridge:
     """Bridge class to handle VBA-Python communication"""
 
+    _logging_configured = False
+
     def __init__(self):
         self.setup_logging()
         self.logger = logging.getLogger(__name__)
 
+        # Resolved workbook path -> (workbook mtime, config mtime, controller)
+        self._vc_cache = OrderedDict()
+
+        # Workbook path -> (monotonic time, request fingerprint, result) of last snapshot
+        self._last_snapshot = {}
+
+        # Action name -> handler; every handler takes (vc, params), where params
+        # also carries the command's workbook_stat so handlers need not stat again
+        self._dispatch = {
+            "create_snapshot": self._create_snapshot,
+            "list_versions": self._list_versions,
+            "compare": self._compare_versions,
+            "rollback": self._rollback,
+            "stats": self._get_stats,
+            "get_version_info": self._get_version_info
+        }
+
     def setup_logging(self):
-        """Setup logging for the bridge"""
-        log_dir = Path("VersionControl") / "logs"
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_dir / "vba_bridge.log"),
-                logging.StreamHandler()
-            ]
-        )
+        """Setup logging for the bridge (once per process)"""
+        if VBAPythonBridge._logging_configured:
+            return
+
+        # basicConfig is a no-op once the root logger has handlers, so only
+        # open the log file when it will actually be attached
+        if not logging.getLogger().handlers:
+            log_dir = Path("VersionControl") / "logs"
+            log_dir.mkdir(parents=True, exist_ok=True)
+
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                handlers=[
+                    logging.FileHandler(log_dir / "vba_bridge.log"),
+                    logging.StreamHandler()
+                ]
+            )
+
+        VBAPythonBridge._logging_configured = True
 
     def execute_command(self, workbook_path: str, action: str, **kwargs) -> Dict[str, Any]:
         """
@@ -56,41 +143,29 @@ class VBAPythonBridge:
         try:
             self.logger.info(f"Executing command: {action} for workbook: {workbook_path}")
 
-            # Validate workbook path
-            if not Path(workbook_path).exists():
+            # Validate workbook path (the stat result also keys the controller cache)
+            try:
+                workbook_stat = os.stat(workbook_path)
+            except FileNotFoundError:
                 return {
                     "success": False,
                     "error": f"Workbook not found: {workbook_path}"
                 }
 
-            # Initialize version controller
-            vc = VersionController(workbook_path)
-
-            # Execute the requested action
-            if action == "create_snapshot":
-                return self._create_snapshot(vc, kwargs)
-
-            elif action == "list_versions":
-                return self._list_versions(vc)
-
-            elif action == "compare":
-                return self._compare_versions(vc, kwargs)
-
-            elif action == "rollback":
-                return self._rollback(vc, kwargs)
+            # Reuse a cached version controller when possible
+            vc = self._get_controller(workbook_path, workbook_stat)
 
-            elif action == "stats":
-                return self._get_stats(vc)
-
-            elif action == "get_version_info":
-                return self._get_version_info(vc, kwargs)
-
-            else:
+            # Execute the requested action; dispatch keys are interned string
+            # literals, so interning the action lets the lookup match by identity
+            handler = self._dispatch.get(sys.intern(action))
+            if handler is None:
                 return {
                     "success": False,
                     "error": f"Unknown action: {action}"
                 }
 
+            return _normalize(handler(vc, {**kwargs, "workbook_stat": workbook_stat}))
+
         except Exception as e:
             self.logger.error(f"Error executing command {action}: {str(e)}")
             return {
@@ -98,15 +173,81 @@ class VBAPythonBridge:
                 "error": str(e)
             }
 
-    def _create_snapshot(self, vc: VersionController, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _get_controller(self, workbook_path: str,
+                        workbook_stat: Optional[os.stat_result] = None) -> "VersionController":
+        """
+        Return a VersionController for the workbook, reusing a cached one
+
+        Cached controllers are rebuilt when the workbook or its config file
+        has been modified since they were created.
+
+        Args:
+            workbook_path: Path to the Excel workbook
+            workbook_stat: Stat result for the workbook, if already available
+
+        Returns:
+            VersionController for the workbook
+        """
+        key = os.path.normcase(os.path.abspath(workbook_path))
+        if workbook_stat is None:
+            workbook_stat = os.stat(key)
+        workbook_mtime = workbook_stat.st_mtime
+
+        cached = self._vc_cache.get(key)
+        if cached is not None:
+            cached_workbook_mtime, cached_config_mtime, vc = cached
+            if (cached_workbook_mtime == workbook_mtime
+                    and self._get_mtime(vc.config_path) == cached_config_mtime):
+                # Serve list/stats from the persisted index, picking up
+                # snapshots written by other processes
+                vc.storage.reload_if_changed()
+                self._vc_cache.move_to_end(key)
+                return vc
+
+        # Deferred so CLI start-up does not pay for openpyxl/pandas imports
+        from version_control import VersionController
+
+        vc = VersionController(workbook_path)
+        self._vc_cache[key] = (workbook_mtime, self._get_mtime(vc.config_path), vc)
+        self._vc_cache.move_to_end(key)
+        if len(self._vc_cache) > VC_CACHE_SIZE:
+            self._vc_cache.popitem(last=False)
+
+        return vc
+
+    @staticmethod
+    def _get_mtime(path: Path) -> Optional[float]:
+        """Return the modification time of path, or None if it does not exist"""
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _create_snapshot(self, vc: "VersionController", params: Dict[str, Any]) -> Dict[str, Any]:
         """Create version snapshot"""
         notes = params.get("notes", "")
         quick_save = params.get("quick", False)
 
+        # Borrow the previous result for a duplicate request (double-click,
+        # macro retry) against an unchanged workbook
+        key = os.path.normcase(os.path.abspath(vc.workbook_path))
+        workbook_stat = params["workbook_stat"]
+        fingerprint = (workbook_stat.st_mtime_ns, workbook_stat.st_size, notes, quick_save)
+        now = time.monotonic()
+
+        previous = self._last_snapshot.get(key)
+        if previous is not None:
+            previous_time, previous_fingerprint, previous_result = previous
+            if previous_fingerprint == fingerprint and now - previous_time <= SNAPSHOT_BORROW_WINDOW:
+                self.logger.info(f"Borrowing snapshot {previous_result.get('version')} for duplicate request")
+                return {**previous_result, "borrowed": True}
+
         result = vc.create_snapshot(notes, quick_save)
+        if result.get("success"):
+            self._last_snapshot[key] = (now, fingerprint, result)
         return result
 
-    def _list_versions(self, vc: VersionController) -> Dict[str, Any]:
+    def _list_versions(self, vc: "VersionController", params: Dict[str, Any]) -> Dict[str, Any]:
         """List all versions"""
         try:
             versions = vc.list_versions()
@@ -121,7 +262,7 @@ class VBAPythonBridge:
                 "error": str(e)
             }
 
-    def _compare_versions(self, vc: VersionController, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _compare_versions(self, vc: "VersionController", params: Dict[str, Any]) -> Dict[str, Any]:
         """Compare current workbook to a version"""
         version_name = params.get("version")
         if not version_name:
@@ -133,7 +274,7 @@ class VBAPythonBridge:
         result = vc.compare_to_version(version_name)
         return result
 
-    def _rollback(self, vc: VersionController, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _rollback(self, vc: "VersionController", params: Dict[str, Any]) -> Dict[str, Any]:
         """Rollback to a specific version"""
         version_name = params.get("version")
         if not version_name:
@@ -146,7 +287,7 @@ class VBAPythonBridge:
         result = vc.rollback_to_version(version_name, backup_current)
         return result
 
-    def _get_stats(self, vc: VersionController) -> Dict[str, Any]:
+    def _get_stats(self, vc: "VersionController", params: Dict[str, Any]) -> Dict[str, Any]:
         """Get project statistics"""
         try:
             stats = vc.get_project_stats()
@@ -160,7 +301,7 @@ class VBAPythonBridge:
                 "error": str(e)
             }
 
-    def _get_version_info(self, vc: VersionController, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _get_version_info(self, vc: "VersionController", params: Dict[str, Any]) -> Dict[str, Any]:
         """Get detailed information about a specific version"""
         version_name = params.get("version")
         if not version_name:
@@ -199,54 +340,245 @@ class VBAPythonBridge:
             True if successful, False otherwise
         """
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, default=str, ensure_ascii=False)
+            if HAS_ORJSON:
+                with open(output_file, 'wb') as f:
+                    f.write(_dumps_result(result))
+            else:
+                # Stream encoded chunks so the full document is never held in memory
+                encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    for chunk in encoder.iterencode(result):
+                        f.write(chunk)
             return True
         except Exception as e:
             self.logger.error(f"Error writing result to file: {str(e)}")
             return False
 
 
-def main():
-    """Command line interface for VBA-Python bridge"""
+# Command line flags that take a value, and boolean switches
+VALUE_FLAGS = {
+    "--workbook": "workbook",
+    "--action": "action",
+    "--output": "output",
+    "--notes": "notes",
+    "--version": "version"
+}
+SWITCH_FLAGS = {
+    "--quick": "quick",
+    "--backup-current": "backup_current",
+    "--serve": "serve"
+}
+
+# File where --serve mode publishes its listening port for VBA
+PORT_FILE = Path("VersionControl") / "logs" / "bridge.port"
+
+
+def parse_args(argv: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse bridge arguments with a lightweight scan of argv
+
+    Args:
+        argv: Command line arguments, excluding the program name
+
+    Returns:
+        Dictionary of parsed options, or None if the arguments need the full
+        argparse parser (help requested or invalid input)
+    """
+    args = {
+        "workbook": None,
+        "action": None,
+        "output": None,
+        "notes": "",
+        "version": None,
+        "quick": False,
+        "backup_current": True,
+        "serve": False
+    }
+
+    tokens = iter(argv)
+    for token in tokens:
+        flag, has_inline_value, inline_value = token.partition("=")
+        if flag in VALUE_FLAGS:
+            value = inline_value if has_inline_value else next(tokens, None)
+            # A flag-like next token (e.g. "--notes --quick") is left to argparse,
+            # which rejects it or accepts it exactly as it would without this path
+            if value is None or (not has_inline_value and value.startswith("-")):
+                return None
+            args[VALUE_FLAGS[flag]] = value
+        elif token in SWITCH_FLAGS:
+            args[SWITCH_FLAGS[token]] = True
+        else:
+            return None
+
+    if not args["serve"] and (not args["workbook"] or not args["action"]):
+        return None
+
+    return args
+
+
+def _parse_args_with_argparse(argv: List[str]) -> Dict[str, Any]:
+    """Parse arguments with argparse (help output and error reporting)"""
+    import argparse
+
     parser = argparse.ArgumentParser(description='VBA-Python Bridge for Version Control')
-    parser.add_argument('--workbook', required=True, help='Path to Excel workbook')
-    parser.add_argument('--action', required=True, help='Action to perform')
+    parser.add_argument('--workbook', help='Path to Excel workbook')
+    parser.add_argument('--action', help='Action to perform')
     parser.add_argument('--output', help='Output file for results')
     parser.add_argument('--notes', default='', help='Notes for snapshot creation')
     parser.add_argument('--version', help='Version name for comparison or rollback')
     parser.add_argument('--quick', action='store_true', help='Quick save (skip optimization)')
     parser.add_argument('--backup-current', action='store_true', default=True,
                        help='Backup current version before rollback')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run as a persistent local server accepting JSON commands')
+
+    args = parser.parse_args(argv)
+    if not args.serve and (not args.workbook or not args.action):
+        parser.error("--workbook and --action are required unless --serve is given")
+
+    return vars(args)
+
+
+def _restrict_to_current_user(path: Path):
+    """Replace a Windows file's inherited ACL with full control for the current user only"""
+    user = os.environ.get("USERNAME")
+    if not user:
+        raise OSError("Cannot determine the current Windows user")
+    if os.environ.get("USERDOMAIN"):
+        user = f"{os.environ['USERDOMAIN']}\\{user}"
+    subprocess.run(
+        ["icacls", str(path), "/inheritance:r", "/grant:r", f"{user}:F"],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def _write_private_file(path: Path, text: str):
+    """Atomically write text to a file only the current user can read"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    if os.name == "nt":
+        # On Windows the mode only sets the read-only attribute, so lock down
+        # the ACL while the file is still empty; without it, refuse to continue
+        os.close(fd)
+        try:
+            _restrict_to_current_user(tmp_path)
+        except (OSError, subprocess.CalledProcessError):
+            tmp_path.unlink()
+            raise
+        fd = os.open(tmp_path, os.O_WRONLY)
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def serve(bridge: VBAPythonBridge, port_file: Path = PORT_FILE):
+    """
+    Serve bridge commands over a local TCP socket until shut down
+
+    Each request is one line of JSON with "token", "workbook", "action" and
+    any action parameters; each response is one line of compact JSON. The
+    chosen port and a random per-run token are written to port_file (one per
+    line, readable only by the current user); requests without the matching
+    token are rejected. Send {"token": ..., "action": "shutdown"} to stop.
+
+    Args:
+        bridge: Bridge used to execute commands (its controller cache stays warm)
+        port_file: Path where the listening port is written
+    """
+    import hmac
+    import secrets
+    import socketserver
+    import threading
+
+    token = secrets.token_hex(32)
+
+    class BridgeRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+
+                try:
+                    request = orjson.loads(line) if HAS_ORJSON else json.loads(line)
+                    authorized = hmac.compare_digest(str(request.pop("token", "")), token)
+                    action = request.pop("action", None)
+                    if not authorized:
+                        result = {"success": False, "error": "Invalid or missing token"}
+                    elif action == "shutdown":
+                        self.wfile.write(_dumps_result({"success": True}, indent=False) + b"\n")
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+                        return
+                    else:
+                        workbook_path = request.pop("workbook", None)
+                        if not workbook_path or not action:
+                            result = {"success": False, "error": "Request requires workbook and action"}
+                        else:
+                            result = bridge.execute_command(workbook_path, action, **request)
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+
+                self.wfile.write(_dumps_result(result, indent=False) + b"\n")
+                self.wfile.flush()
+
+    with socketserver.TCPServer(("127.0.0.1", 0), BridgeRequestHandler) as server:
+        port = server.server_address[1]
+        _write_private_file(port_file, f"{port}\n{token}\n")
+        bridge.logger.info(f"Bridge serving on 127.0.0.1:{port}")
 
-    args = parser.parse_args()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if port_file.exists():
+                port_file.unlink()
+
+
+def main():
+    """Command line interface for VBA-Python bridge"""
+    # Fast path for VBA-dispatched calls; argparse only for help/errors
+    args = parse_args(sys.argv[1:])
+    if args is None:
+        args = _parse_args_with_argparse(sys.argv[1:])
+
+    # Read-only actions skip file logging entirely
+    if not args['serve'] and args['action'] in READ_ONLY_ACTIONS:
+        logging.getLogger().addHandler(logging.NullHandler())
 
     # Initialize bridge
     bridge = VBAPythonBridge()
 
+    if args['serve']:
+        serve(bridge)
+        return
+
     # Prepare parameters
     params = {
-        'notes': args.notes,
-        'version': args.version,
-        'quick': args.quick,
-        'backup_current': args.backup_current
+        'notes': args['notes'],
+        'version': args['version'],
+        'quick': args['quick'],
+        'backup_current': args['backup_current']
     }
 
     # Remove None values
     params = {k: v for k, v in params.items() if v is not None}
 
     # Execute command
-    result = bridge.execute_command(args.workbook, args.action, **params)
+    result = bridge.execute_command(args['workbook'], args['action'], **params)
 
     # Output result
-    if args.output:
+    if args['output']:
         # Write to specified file
-        success = bridge.write_result_to_file(result, args.output)
+        success = bridge.write_result_to_file(result, args['output'])
         if not success:
             sys.exit(1)
     else:
-        # Print to stdout for VBA to capture
-        print(json.dumps(result, indent=2, default=str, ensure_ascii=False))
+        # Print compact ASCII JSON to stdout for VBA to capture
+        sys.stdout.buffer.write(_dumps_result(result, indent=False, ensure_ascii=True) + b"\n")
+        sys.stdout.flush()
 
     # Exit with appropriate code
     if result.get('success', False):
@@ -4,30 +4,78 @@ Version Control System for Excel Databooks
 Main controller module that handles version creation, management, and coordination
 """
 
-import argparse
 import json
 import shutil
 import hashlib
+import mmap
 import logging
+import logging.handlers
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-import yaml
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the VersionControl directory to Python path for imports
-current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
+current_dir = str(Path(__file__).parent)
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
 
-from metrics_extractor import MetricsExtractor
-from comparator import WorkbookComparator
 from storage_manager import StorageManager
 
+# Read size for file hashing
+HASH_CHUNK_SIZE = 1 << 20
+
+# Concurrent unlinks when cleaning up old versions
+CLEANUP_WORKERS = 8
+
+# Size-based log rotation: roll over at 5 MB, keep 7 old files
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 7
+
+# --action values of this module's CLI that get a NullHandler instead of log files
+READ_ONLY_ACTIONS = ('list_versions', 'stats')
+
+
+class HashingWriter:
+    """
+    Write-only file wrapper that hashes bytes as they are written
+
+    It is deliberately not seekable, so zipfile streams entries with data
+    descriptors instead of seeking back to patch headers already hashed.
+    """
+
+    def __init__(self, file_obj, hasher):
+        self.file_obj = file_obj
+        self.hasher = hasher
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.hasher.update(data)
+        self.file_obj.write(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self):
+        self.file_obj.flush()
+
+    def close(self):
+        self.file_obj.close()
+
 
 class VersionController:
     """Main version control system coordinator"""
 
+    _logging_configured = False
+
     def __init__(self, workbook_path: str, config_path: Optional[str] = None):
         """
         Initialize version controller
@@ -47,45 +95,98 @@ class VersionController:
 
         self.config = self._load_config()
 
+        # Serializes version number reservation across concurrent snapshots;
+        # numbers stay reserved only while their snapshot is in progress
+        self._version_lock = threading.Lock()
+        self._reserved_versions = set()
+
+        # (index generation, formatted list) memo for list_versions
+        self._version_list_cache = None
+
         # Initialize components
         self.storage = StorageManager(self.project_name, self.config)
         self.setup_logging()
+        self._validate_hash_algo()
 
         # Ensure directories exist
         self._setup_directories()
 
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML file"""
+        """Load configuration from YAML file, via a JSON sidecar cache when fresh"""
         try:
+            config_stat = self.config_path.stat()
+            source = [config_stat.st_mtime_ns, config_stat.st_size]
+            sidecar_path = self.config_path.with_suffix(self.config_path.suffix + ".json")
+
+            # Use the cached parse only if it was made from this exact YAML file;
+            # a copied-in config can carry an older mtime than the sidecar
+            try:
+                cached = json.loads(sidecar_path.read_bytes())
+                if cached.get("source") == source:
+                    return cached["config"]
+            except (OSError, ValueError, AttributeError, KeyError):
+                pass
+
+            import yaml
+
+            # libyaml-backed safe loader when PyYAML was built with it
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
             with open(self.config_path, 'r') as f:
-                return yaml.safe_load(f)
+                config = yaml.load(f, Loader=loader)
+
+            self._write_config_sidecar(sidecar_path, source, config)
+            return config
         except Exception as e:
             # Return default config if file not found
             return self._get_default_config()
 
+    def _write_config_sidecar(self, sidecar_path: Path, source: List[int], config: Dict[str, Any]):
+        """Atomically cache the parsed config as JSON next to the YAML file"""
+        tmp_path = sidecar_path.with_suffix(sidecar_path.suffix + ".tmp")
+        try:
+            sidecar = {"source": source, "config": config}
+            tmp_path.write_text(json.dumps(sidecar), encoding='utf-8')
+            os.replace(tmp_path, sidecar_path)
+        except (OSError, TypeError, ValueError):
+            # Caching is best-effort (e.g. read-only install or non-JSON values)
+            if tmp_path.exists():
+                tmp_path.unlink()
+
     def _get_default_config(self) -> Dict[str, Any]:
         """Return default configuration"""
         return {
             "version_control": {"max_versions": 50, "auto_cleanup": True},
             "metrics": {"locations": {}},
             "comparison": {"tolerance": 0.01, "ignore_sheets": []},
-            "storage": {"compression": True, "optimize_snapshots": True}
+            "storage": {"compression": True, "optimize_snapshots": True, "hash_algo": "blake2b"}
         }
 
     def setup_logging(self):
-        """Set up logging configuration"""
-        log_dir = Path("VersionControl") / "logs"
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_dir / f"version_control_{datetime.now().strftime('%Y%m%d')}.log"),
-                logging.StreamHandler()
-            ]
-        )
+        """Set up logging configuration (once per process)"""
         self.logger = logging.getLogger(__name__)
+        if VersionController._logging_configured:
+            return
+
+        # Leave logging alone when the bridge or a read-only CLI action already
+        # configured the root logger; otherwise the rotating file is opened here
+        if not logging.getLogger().handlers:
+            log_dir = Path("VersionControl") / "logs"
+            log_dir.mkdir(parents=True, exist_ok=True)
+
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                handlers=[
+                    logging.handlers.RotatingFileHandler(
+                        log_dir / "version_control.log",
+                        maxBytes=LOG_MAX_BYTES,
+                        backupCount=LOG_BACKUP_COUNT
+                    ),
+                    logging.StreamHandler()
+                ]
+            )
+
+        VersionController._logging_configured = True
 
     def _setup_directories(self):
         """Create necessary directory structure"""
@@ -96,17 +197,20 @@ class VersionController:
         for directory in [self.versions_dir, self.reports_dir]:
             directory.mkdir(parents=True, exist_ok=True)
 
-    def create_snapshot(self, notes: str = "", quick_save: bool = False) -> Dict[str, Any]:
+    def create_snapshot(self, notes: str = "", quick_save: bool = False,
+                        skip_metrics: bool = False) -> Dict[str, Any]:
         """
         Create a new version snapshot
 
         Args:
             notes: User notes for this version
             quick_save: If True, skip optimization for speed
+            skip_metrics: If True, store the snapshot without extracting metrics
 
         Returns:
             Dictionary with version information
         """
+        version_num = None
         try:
             self.logger.info(f"Creating snapshot for {self.project_name}")
 
@@ -114,8 +218,11 @@ class VersionController:
             if not self.workbook_path.exists():
                 raise FileNotFoundError(f"Workbook not found: {self.workbook_path}")
 
-            # Get next version number
-            version_num = self.storage.get_next_version_number()
+            # Reserve next version number (safe for concurrent snapshots)
+            with self._version_lock:
+                version_num = max(self.storage.get_next_version_number(),
+                                  max(self._reserved_versions, default=0) + 1)
+                self._reserved_versions.add(version_num)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             version_name = f"v{version_num:03d}"
 
@@ -123,21 +230,59 @@ class VersionController:
             snapshot_filename = f"{version_name}_{timestamp}.xlsx"
             snapshot_path = self.versions_dir / snapshot_filename
 
-            # Extract metrics before creating snapshot
-            self.logger.info("Extracting metrics...")
-            metrics_extractor = MetricsExtractor(str(self.workbook_path), self.config)
-            metrics = metrics_extractor.extract()
-
-            # Create optimized snapshot
-            if quick_save:
-                # Quick copy without optimization
-                shutil.copy2(self.workbook_path, snapshot_path)
+            # Hash the workbook first so an unchanged save can reuse the latest snapshot
+            source_stat = self.workbook_path.stat()
+            source_hash = self._calculate_file_hash(self.workbook_path)
+            previous = self.storage.get_latest_version()
+            duplicate_of = None
+
+            if (previous and previous.get("hash") == source_hash
+                    and previous.get("hash_algo", "sha256") == self._hash_algo()
+                    and Path(previous["file_path"]).exists()):
+                # Workbook is byte-identical to the latest snapshot
+                self.logger.info(f"Workbook unchanged since {previous['version']}, reusing snapshot")
+                duplicate_of = previous["version"]
+                if previous.get("metrics_skipped") and not skip_metrics:
+                    # The earlier snapshot never extracted metrics, so do it now
+                    metrics = self._extract_metrics()
+                    metrics_skipped = False
+                else:
+                    metrics = previous.get("metrics", {})
+                    metrics_skipped = previous.get("metrics_skipped", False)
+                if self._link_snapshot(Path(previous["file_path"]), snapshot_path):
+                    file_hash = source_hash
+                else:
+                    file_hash = self._copy_workbook(snapshot_path, source_hash, source_stat)
             else:
-                # Optimized copy with cleanup
-                self._create_optimized_snapshot(snapshot_path)
-
-            # Calculate file hash
-            file_hash = self._calculate_file_hash(snapshot_path)
+                metrics_skipped = skip_metrics
+                trims = {}
+                if not quick_save and self.config["storage"]["optimize_snapshots"]:
+                    trims = self._plan_trims()
+
+                if trims and not skip_metrics:
+                    # One formula-mode load serves the formula count and then the trim,
+                    # so metrics are read before the workbook is modified
+                    from openpyxl import load_workbook
+
+                    workbook = load_workbook(str(self.workbook_path))
+                    metrics = self._extract_metrics(formula_workbook=workbook)
+                    file_hash = self._create_optimized_snapshot(snapshot_path, source_hash, workbook, trims)
+                else:
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        # Extract metrics from the source while the snapshot is written
+                        metrics_future = None if skip_metrics else executor.submit(self._extract_metrics)
+
+                        # Create optimized snapshot
+                        if quick_save:
+                            # Quick copy without optimization
+                            file_hash = self._copy_workbook(snapshot_path, source_hash, source_stat)
+                        else:
+                            # Optimized copy with cleanup
+                            file_hash = self._create_optimized_snapshot(
+                                snapshot_path, source_hash, trims=trims, source_stat=source_stat
+                            )
+
+                        metrics = metrics_future.result() if metrics_future else {}
 
             # Create version metadata
             version_info = {
@@ -149,8 +294,13 @@ class VersionController:
                 "metrics": metrics,
                 "notes": notes,
                 "hash": file_hash,
+                "hash_algo": self._hash_algo(),
                 "quick_save": quick_save
             }
+            if duplicate_of:
+                version_info["duplicate_of"] = duplicate_of
+            if metrics_skipped:
+                version_info["metrics_skipped"] = True
 
             # Save metadata
             self.storage.save_version_metadata(version_info)
@@ -176,55 +326,219 @@ class VersionController:
                 "error": str(e)
             }
 
-    def _create_optimized_snapshot(self, snapshot_path: Path):
-        """Create optimized snapshot by removing unused areas"""
+        finally:
+            # Saved versions advance the storage counter; failed ones free their number
+            if version_num is not None:
+                with self._version_lock:
+                    self._reserved_versions.discard(version_num)
+
+    def _extract_metrics(self, formula_workbook=None) -> Dict[str, Any]:
+        """Extract key metrics from the current workbook"""
+        from metrics_extractor import MetricsExtractor
+
+        self.logger.info("Extracting metrics...")
+        metrics_extractor = MetricsExtractor(
+            str(self.workbook_path), self.config, formula_workbook=formula_workbook
+        )
+        return metrics_extractor.extract()
+
+    def _create_optimized_snapshot(self, snapshot_path: Path, source_hash: Optional[str] = None,
+                                   workbook=None, trims: Optional[Dict[str, tuple]] = None,
+                                   source_stat: Optional[os.stat_result] = None) -> str:
+        """
+        Create optimized snapshot by removing unused areas
+
+        Args:
+            snapshot_path: Destination for the snapshot
+            source_hash: Hash of the workbook, if already known
+            workbook: Workbook already loaded with formulas; modified and closed here
+            trims: Trim ranges from _plan_trims, if already computed
+            source_stat: Workbook stat taken before source_hash was computed
+
+        Returns:
+            Hash of the snapshot
+        """
         from openpyxl import load_workbook
 
+        if trims is None:
+            trims = self._plan_trims() if self.config["storage"]["optimize_snapshots"] else {}
+        if not trims:
+            # Nothing to remove, so skip the openpyxl parse and rewrite
+            return self._copy_workbook(snapshot_path, source_hash, source_stat)
+
         # Load workbook
-        wb = load_workbook(str(self.workbook_path))
+        wb = workbook if workbook is not None else load_workbook(str(self.workbook_path))
+
+        # Remove empty rows and columns at the end in one call each
+        for sheet in wb.worksheets:
+            if sheet.title not in trims:
+                continue
+            last_row, last_col = trims[sheet.title]
+            if last_row < sheet.max_row:
+                sheet.delete_rows(last_row + 1, sheet.max_row - last_row)
+            if last_col < sheet.max_column:
+                sheet.delete_cols(last_col + 1, sheet.max_column - last_col)
+
+        # Save optimized workbook, hashing the stream as it is written
+        hasher = self._new_hasher()
+        with open(snapshot_path, "wb") as f:
+            wb.save(HashingWriter(f, hasher))
+        wb.close()
+        return hasher.hexdigest()
+
+    def _copy_workbook(self, snapshot_path: Path, source_hash: Optional[str] = None,
+                       source_stat: Optional[os.stat_result] = None) -> str:
+        """
+        Copy the workbook to snapshot_path and return the hash of the copied bytes
 
-        if self.config["storage"]["optimize_snapshots"]:
-            # Remove empty rows and columns from each sheet
+        source_hash is reused only if the copy still has the size and mtime the
+        workbook had before it was hashed; otherwise the workbook was saved in
+        between (e.g. by Excel) and the copy is hashed itself.
+        """
+        shutil.copy2(self.workbook_path, snapshot_path)
+        if source_hash and source_stat:
+            copied = snapshot_path.stat()
+            if (copied.st_mtime_ns, copied.st_size) == (source_stat.st_mtime_ns, source_stat.st_size):
+                return source_hash
+        return self._calculate_file_hash(snapshot_path)
+
+    def _plan_trims(self) -> Dict[str, tuple]:
+        """Find the sheets with trailing empty rows or columns using a read-only pass"""
+        from openpyxl import load_workbook
+
+        trims = {}
+        wb = load_workbook(str(self.workbook_path), read_only=True)
+        try:
             for sheet in wb.worksheets:
+                # Read-only iter_rows stops at the declared <dimension>, which can be stale
+                sheet.reset_dimensions()
+                last_row, last_col, row_count, col_count = self._find_trim_bounds(sheet)
                 # Get used range
-                if sheet.max_row > 1 and sheet.max_column > 1:
-                    # Remove empty rows at the end
-                    for row in range(sheet.max_row, 0, -1):
-                        if any(sheet.cell(row, col).value for col in range(1, sheet.max_column + 1)):
-                            break
-                        sheet.delete_rows(row)
-
-                    # Remove empty columns at the end
-                    for col in range(sheet.max_column, 0, -1):
-                        if any(sheet.cell(row, col).value for row in range(1, sheet.max_row + 1)):
-                            break
-                        sheet.delete_cols(col)
-
-        # Save optimized workbook
-        wb.save(str(snapshot_path))
-        wb.close()
+                if row_count > 1 and col_count > 1 and (last_row < row_count or last_col < col_count):
+                    trims[sheet.title] = (last_row, last_col)
+        finally:
+            wb.close()
+        return trims
+
+    @staticmethod
+    def _find_trim_bounds(sheet) -> tuple:
+        """Return the last row and column holding a value and the scanned extent, in one pass"""
+        last_row = 0
+        last_col = 0
+        row_count = 0
+        col_count = 0
+        rows = sheet.iter_rows(min_row=1, min_col=1, values_only=True)
+        for row_index, values in enumerate(rows, start=1):
+            row_count = row_index
+            col_count = max(col_count, len(values))
+            if not any(values):
+                continue
+            last_row = row_index
+            # Only columns right of the current bound can widen it
+            for col_index in range(len(values), last_col, -1):
+                if values[col_index - 1]:
+                    last_col = col_index
+                    break
+        return last_row, last_col, row_count, col_count
+
+    def _restore_file(self, source_path: Path, destination_path: Path):
+        """Atomically replace destination with a copy of source, copying in-kernel where possible"""
+        tmp_path = destination_path.with_suffix(destination_path.suffix + ".tmp")
+        try:
+            if not self._copy_file_range(source_path, tmp_path):
+                shutil.copy2(source_path, tmp_path)
+            os.replace(tmp_path, destination_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _copy_file_range(source_path: Path, destination_path: Path) -> bool:
+        """Copy via os.copy_file_range (reflinks on btrfs/XFS); returns False where unsupported"""
+        if not hasattr(os, "copy_file_range"):
+            return False
+        try:
+            with open(source_path, "rb") as src, open(destination_path, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if not copied:
+                        return False
+                    remaining -= copied
+        except OSError:
+            return False
+        shutil.copystat(source_path, destination_path)
+        return True
+
+    def _link_snapshot(self, existing_path: Path, snapshot_path: Path) -> bool:
+        """Hardlink an identical existing snapshot; returns False where links are unsupported"""
+        try:
+            os.link(existing_path, snapshot_path)
+            return True
+        except OSError as e:
+            self.logger.debug(f"Hardlink failed, copying instead: {str(e)}")
+            return False
+
+    def _validate_hash_algo(self):
+        """Fall back to sha256 if storage.hash_algo is not a fixed-length hashlib algorithm"""
+        storage_config = self.config.get("storage", {})
+        algo = storage_config.get("hash_algo", "sha256")
+        try:
+            # Unknown names raise ValueError; shake_* digests need a length (TypeError)
+            hashlib.new(algo).hexdigest()
+        except (ValueError, TypeError):
+            self.logger.warning(f"Unsupported storage.hash_algo {algo!r}, using sha256")
+            storage_config["hash_algo"] = "sha256"
+
+    def _hash_algo(self) -> str:
+        """Name of the hashlib algorithm used to fingerprint snapshots"""
+        return self.config["storage"].get("hash_algo", "sha256")
+
+    def _new_hasher(self):
+        """Create a hash object for the configured algorithm"""
+        return hashlib.new(self._hash_algo())
 
     def _calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate SHA-256 hash of file"""
-        hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+        """Calculate the configured hash (storage.hash_algo) of a file"""
+        with open(file_path, "rb", buffering=0) as f:
+            # On POSIX, hash larger files straight from the page cache with no read() copies
+            if os.name == "posix" and os.fstat(f.fileno()).st_size >= HASH_CHUNK_SIZE:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    hasher = self._new_hasher()
+                    hasher.update(mapped)
+                    return hasher.hexdigest()
+
+            # Python 3.11+: read loop runs in C
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, self._new_hasher).hexdigest()
+
+            hasher = self._new_hasher()
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                bytes_read = f.readinto(buffer)
+                if not bytes_read:
+                    break
+                hasher.update(view[:bytes_read])
+        return hasher.hexdigest()
 
     def list_versions(self) -> List[Dict[str, Any]]:
         """Get list of all versions for this project"""
         try:
-            versions = self.storage.get_all_versions()
+            # Reuse the formatted list until the versions index changes
+            generation = self.storage.index_generation
+            if self._version_list_cache and self._version_list_cache[0] == generation:
+                return list(self._version_list_cache[1])
 
             # Format for Excel dropdown
             version_list = []
-            for version in versions:
+            for version in self.storage.get_all_versions():
                 display_text = f"{version['version']} - {version['timestamp']}"
-                if version.get('notes'):
-                    display_text += f" - {version['notes'][:30]}"
-                    if len(version['notes']) > 30:
-                        display_text += "..."
+                notes = version.get('notes')
+                if notes:
+                    display_text += f" - {notes if len(notes) <= 30 else notes[:30] + '...'}"
 
                 version_list.append({
                     "value": version['version'],
@@ -234,7 +548,8 @@ class VersionController:
                     "metrics": version.get('metrics', {})
                 })
 
-            return version_list
+            self._version_list_cache = (generation, version_list)
+            return list(version_list)
 
         except Exception as e:
             self.logger.error(f"Failed to list versions: {str(e)}")
@@ -255,6 +570,8 @@ class VersionController:
                 raise FileNotFoundError(f"Version file not found: {version_path}")
 
             # Create comparator
+            from comparator import WorkbookComparator
+
             comparator = WorkbookComparator(
                 str(self.workbook_path),
                 str(version_path),
@@ -284,22 +601,33 @@ class VersionController:
     def _generate_comparison_report(self, results: Dict[str, Any], version_name: str) -> Path:
         """Generate Excel comparison report"""
         import pandas as pd
+        from openpyxl.formatting.rule import FormulaRule
         from openpyxl.styles import PatternFill
+        from openpyxl.utils import get_column_letter
 
         # Create report filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_filename = f"comparison_{self.project_name}_{version_name}_{timestamp}.xlsx"
         report_path = self.reports_dir / report_filename
 
+        # Build the changes frame once; it feeds both the summary counts and the detail sheet
+        changes_df = pd.DataFrame(results.get('cell_changes', []))
+        total_changes = len(changes_df)
+
+        def count_flagged(column: str) -> int:
+            if column not in changes_df:
+                return 0
+            return int(changes_df[column].fillna(False).astype(bool).sum())
+
         with pd.ExcelWriter(str(report_path), engine='openpyxl') as writer:
             # Summary sheet
             summary_data = {
                 "Metric": ["Total Changes", "Sheets Modified", "Major Changes", "Formula Changes"],
                 "Count": [
-                    len(results.get('cell_changes', [])),
-                    len(set(change['sheet'] for change in results.get('cell_changes', []))),
-                    len([c for c in results.get('cell_changes', []) if c.get('major_change', False)]),
-                    len([c for c in results.get('cell_changes', []) if c.get('formula_change', False)])
+                    total_changes,
+                    int(changes_df['sheet'].nunique()) if total_changes else 0,
+                    count_flagged('major_change'),
+                    count_flagged('formula_change')
                 ]
             }
 
@@ -314,17 +642,19 @@ class VersionController:
             summary_df.to_excel(writer, sheet_name='Summary', index=False)
 
             # Cell changes detail
-            if results.get('cell_changes'):
-                changes_df = pd.DataFrame(results['cell_changes'])
+            if total_changes:
                 changes_df.to_excel(writer, sheet_name='Cell Changes', index=False)
 
-                # Apply formatting
-                worksheet = writer.sheets['Cell Changes']
-                for idx, change in enumerate(results['cell_changes'], 2):  # Start from row 2 (after header)
-                    if change.get('major_change', False):
-                        fill = PatternFill(start_color='FFAAAA', end_color='FFAAAA', fill_type='solid')
-                        for col in range(1, len(changes_df.columns) + 1):
-                            worksheet.cell(row=idx, column=col).fill = fill
+                # Highlight major changes with one conditional format rule that Excel evaluates
+                if 'major_change' in changes_df:
+                    worksheet = writer.sheets['Cell Changes']
+                    flag_col = get_column_letter(changes_df.columns.get_loc('major_change') + 1)
+                    last_col = get_column_letter(len(changes_df.columns))
+                    fill = PatternFill(start_color='FFAAAA', end_color='FFAAAA', fill_type='solid')
+                    worksheet.conditional_formatting.add(
+                        f"A2:{last_col}{total_changes + 1}",  # Data rows start after the header
+                        FormulaRule(formula=[f"${flag_col}2=TRUE"], fill=fill)
+                    )
 
         return report_path
 
@@ -333,13 +663,7 @@ class VersionController:
         try:
             self.logger.info(f"Rolling back to version {version_name}")
 
-            # Backup current version if requested
-            if backup_current:
-                backup_result = self.create_snapshot(f"Backup before rollback to {version_name}", quick_save=True)
-                if not backup_result['success']:
-                    raise Exception(f"Failed to create backup: {backup_result['error']}")
-
-            # Get version info
+            # Get version info before writing anything
             version_info = self.storage.get_version_info(version_name)
             if not version_info:
                 raise ValueError(f"Version {version_name} not found")
@@ -348,9 +672,18 @@ class VersionController:
             if not version_path.exists():
                 raise FileNotFoundError(f"Version file not found: {version_path}")
 
+            # Backup current version if requested
+            if backup_current:
+                # Backups exist for restorability, so skip the metrics parse
+                backup_result = self.create_snapshot(
+                    f"Backup before rollback to {version_name}", quick_save=True, skip_metrics=True
+                )
+                if not backup_result['success']:
+                    raise Exception(f"Failed to create backup: {backup_result['error']}")
+
             # Close current workbook (this would need to be handled by VBA)
-            # For now, just copy the file
-            shutil.copy2(version_path, self.workbook_path)
+            # For now, just replace the file
+            self._restore_file(version_path, self.workbook_path)
 
             self.logger.info(f"Successfully rolled back to {version_name}")
 
@@ -376,17 +709,29 @@ class VersionController:
             # Sort by timestamp (oldest first)
             versions.sort(key=lambda x: x['timestamp'])
 
-            # Remove oldest versions
+            # Remove oldest versions concurrently, then log in order
             versions_to_remove = versions[:-max_versions]
-            for version in versions_to_remove:
-                try:
-                    version_path = Path(version['file_path'])
-                    if version_path.exists():
-                        version_path.unlink()
-                    self.storage.remove_version_metadata(version['version'])
+            if not versions_to_remove:
+                # max_versions of 0 slices to nothing
+                return
+            workers = min(CLEANUP_WORKERS, len(versions_to_remove))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                errors = list(executor.map(self._remove_one_version, versions_to_remove))
+
+            for version, error in zip(versions_to_remove, errors):
+                if error:
+                    self.logger.warning(f"Failed to cleanup version {version['version']}: {error}")
+                else:
                     self.logger.info(f"Cleaned up old version: {version['version']}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to cleanup version {version['version']}: {str(e)}")
+
+    def _remove_one_version(self, version: Dict[str, Any]) -> Optional[str]:
+        """Delete one version's snapshot and metadata; returns an error message on failure"""
+        try:
+            Path(version['snapshot_file']).unlink(missing_ok=True)
+            self.storage.remove_version_metadata(version['version'])
+            return None
+        except Exception as e:
+            return str(e)
 
     def get_project_stats(self) -> Dict[str, Any]:
         """Get statistics about the project"""
@@ -410,6 +755,8 @@ class VersionController:
 
 def main():
     """Command line interface for the version control system"""
+    import argparse
+
     parser = argparse.ArgumentParser(description='Excel Databook Version Control System')
     parser.add_argument('--action', required=True,
                        choices=['create_snapshot', 'list_versions', 'compare', 'rollback', 'stats'],
@@ -422,6 +769,10 @@ def main():
 
     args = parser.parse_args()
 
+    # Read-only actions skip file logging entirely
+    if args.action in READ_ONLY_ACTIONS:
+        logging.getLogger().addHandler(logging.NullHandler())
+
     # Initialize version controller
     vc = VersionController(args.workbook, args.config)
 